@@ -1,7 +1,8 @@
 import pygame
-import math
+import pygame.freetype
 import random
-import time
+from functools import lru_cache
+from itertools import count
 
 # Initialize Pygame
 pygame.init()
@@ -12,15 +13,20 @@ WIN = pygame.display.set_mode((WIDTH, HEIGHT))  # Create the game window
 pygame.display.set_caption("Aim Trainer")  # Set the window title
 
 TARGET_INCREMENT = 3000  # Time interval (in milliseconds) between target spawns
-TARGET_EVENT = pygame.USEREVENT  # Custom event for target spawning
 
 TARGET_PADDING = 30  # Minimum distance from the window edge for target spawns
+SPAWN_BATCH = 1024  # Number of spawn positions generated at a time
 
 BG_COLOR = (0, 25, 40)  # Background color
 LIVES = 3  # Number of lives the player has
 TOP_BAR_HEIGHT = 50  # Height of the top bar displaying game info
+TOP_BAR_RECT = pygame.Rect(0, 0, WIDTH, TOP_BAR_HEIGHT)  # Screen area covered by the top bar
 
-LABEL_FONT = pygame.font.SysFont("comicsans", 24)  # Font for labels
+BG_SURF = pygame.Surface((WIDTH, HEIGHT)).convert()  # Pre-rendered background, including the top bar
+BG_SURF.fill(BG_COLOR)
+pygame.draw.rect(BG_SURF, "grey", TOP_BAR_RECT)
+
+LABEL_FONT = pygame.freetype.SysFont("comicsans", 24)  # Font for labels
 
 class Target:
     """
@@ -31,10 +37,15 @@ class Target:
     - GROWTH_RATE (float): The rate at which the target grows.
     - COLOR (str): The primary color of the target.
     - SECOND_COLOR (str): The secondary color of the target.
+    - RINGS (tuple): (color, numerator, denominator) of each ring's radius relative to the size.
+    - SPRITES (list): Pre-rendered target surfaces, indexed by integer size.
+    - SPAWN_ORDER (itertools.count): Source of each target's `order`, so newer targets compare higher.
 
     Methods:
     - __init__(x, y): Initializes a target with a given position.
-    - update(): Updates the target's size and growth.
+    - make_sprite(size): Renders the target at a given size onto a surface.
+    - sprite(): Returns the target's current sprite and blit position.
+    - update(): Updates the target's size, turning it around once fully grown.
     - draw(win): Draws the target on the given Pygame window.
     - collide(x, y): Checks if a point (x, y) collides with the target.
 
@@ -49,6 +60,10 @@ class Target:
     GROWTH_RATE = 0.2
     COLOR = "red"
     SECOND_COLOR = "white"
+    RINGS = ((COLOR, 5, 5), (SECOND_COLOR, 4, 5), (COLOR, 3, 5), (SECOND_COLOR, 2, 5))
+    SPAWN_ORDER = count()
+
+    __slots__ = ("x", "y", "size", "rate", "order")
 
     def __init__(self, x, y):
         """
@@ -61,19 +76,45 @@ class Target:
         self.x = x
         self.y = y
         self.size = 0
-        self.growth = True
+        self.rate = self.GROWTH_RATE
+        self.order = next(self.SPAWN_ORDER)
 
-    def update(self):
+    def update(self, _rate=GROWTH_RATE, _max_size=MAX_SIZE):
         """
-        Updates the target's size and growth.
+        Updates the target's size, turning it around once it is fully grown.
+
+        The class constants are bound as defaults so they are read as locals.
         """
-        if self.size + self.GROWTH_RATE >= self.MAX_SIZE:
-            self.growth = False
+        self.size += self.rate
+        if self.size + _rate >= _max_size:
+            self.rate = -_rate
 
-        if self.growth:
-            self.size += self.GROWTH_RATE
-        else:
-            self.size -= self.GROWTH_RATE
+    @classmethod
+    def make_sprite(cls, size):
+        """
+        Renders the target's rings at the given size onto a transparent surface.
+
+        Parameters:
+        - size (int): The radius of the outer ring.
+
+        Returns:
+        pygame.Surface: A surface of side 2 * MAX_SIZE with the target centered on it.
+        """
+        surface = pygame.Surface((2 * cls.MAX_SIZE, 2 * cls.MAX_SIZE), pygame.SRCALPHA)
+        center = (cls.MAX_SIZE, cls.MAX_SIZE)
+        circle = pygame.draw.circle
+        for color, num, den in cls.RINGS:
+            circle(surface, color, center, size * num // den)
+        return surface.convert_alpha()
+
+    def sprite(self):
+        """
+        Returns the sprite for the target's current size and where to blit it.
+
+        Returns:
+        tuple: A (pygame.Surface, (x, y)) pair suitable for `Surface.blits`.
+        """
+        return self.SPRITES[int(self.size)], (self.x - self.MAX_SIZE, self.y - self.MAX_SIZE)
 
     def draw(self, win):
         """
@@ -82,10 +123,8 @@ class Target:
         Parameters:
         - win (pygame.Surface): The Pygame window surface.
         """
-        pygame.draw.circle(win, self.COLOR, (self.x, self.y), self.size)
-        pygame.draw.circle(win, self.SECOND_COLOR, (self.x, self.y), self.size * 0.8)
-        pygame.draw.circle(win, self.COLOR, (self.x, self.y), self.size * 0.6)
-        pygame.draw.circle(win, self.SECOND_COLOR, (self.x, self.y), self.size * 0.4)
+        if self.size >= 1:
+            win.blit(*self.sprite())
 
     def collide(self, x, y):
         """
@@ -98,77 +137,219 @@ class Target:
         Returns:
         bool: True if the point collides with the target, False otherwise.
         """
-        dis = math.sqrt((self.x - x) ** 2 + (self.y - y) ** 2)
-        return dis <= self.size
+        dx = self.x - x
+        dy = self.y - y
+        return dx * dx + dy * dy <= self.size * self.size
+
+# Pre-render one sprite per integer size so drawing a target is a single blit
+Target.SPRITES = [Target.make_sprite(size) for size in range(Target.MAX_SIZE + 1)]
+
+class TargetGrid:
+    """
+    The `TargetGrid` class buckets targets into a uniform grid so a click only
+    has to be tested against the targets in the cells around it.
+
+    Attributes:
+    - CELL_SIZE (int): The side length of a grid cell, wide enough that a target
+      can only be hit from its own cell or a neighbouring one.
+
+    Methods:
+    - __init__(): Initializes an empty grid.
+    - add(target): Adds a target to the cell containing its center.
+    - remove(target): Removes a target from its cell.
+    - hit(x, y): Returns the topmost target colliding with the point (x, y), if any.
 
-def draw(win, targets):
+    Example Usage:
+    >>> grid = TargetGrid()
+    >>> grid.add(Target(100, 200))
+    >>> target = grid.hit(105, 200)
     """
-    Draws the targets on the window.
+
+    CELL_SIZE = 2 * Target.MAX_SIZE
+
+    def __init__(self):
+        """
+        Initializes an empty grid.
+        """
+        self.cells = {}
+
+    def add(self, target):
+        """
+        Adds a target to the cell containing its center.
+
+        Parameters:
+        - target (Target): The target to add.
+        """
+        key = (target.x // self.CELL_SIZE, target.y // self.CELL_SIZE)
+        self.cells.setdefault(key, []).append(target)
+
+    def remove(self, target):
+        """
+        Removes a target from its cell, dropping the cell once it is empty.
+
+        Parameters:
+        - target (Target): The target to remove.
+        """
+        key = (target.x // self.CELL_SIZE, target.y // self.CELL_SIZE)
+        cell = self.cells[key]
+        cell.remove(target)
+        if not cell:
+            del self.cells[key]
+
+    def hit(self, x, y):
+        """
+        Finds the topmost target colliding with the point (x, y).
+
+        Targets are drawn in spawn order, so when several overlap the point the
+        most recently spawned one is the one on top and is the one returned.
+
+        Parameters:
+        - x (int): The x-coordinate of the point.
+        - y (int): The y-coordinate of the point.
+
+        Returns:
+        Target: The newest target containing the point, or None if there is none.
+        """
+        cx = x // self.CELL_SIZE
+        cy = y // self.CELL_SIZE
+        found = None
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for target in self.cells.get((gx, gy), ()):
+                    if (found is None or target.order > found.order) and target.collide(x, y):
+                        found = target
+        return found
+
+def draw(win, targets, erase):
+    """
+    Draws the targets on the window, erasing what was drawn in the previous frame.
 
     Parameters:
     - win (pygame.Surface): The Pygame window surface.
     - targets (list): A list of Target objects to be drawn.
+    - erase (list): The rectangles returned by the previous call to `draw`.
+
+    Returns:
+    list: The rectangles covered by the targets drawn this frame.
     """
-    win.fill(BG_COLOR)
+    for rect in erase:
+        win.blit(BG_SURF, rect, rect)
+    # Targets under one pixel wide have an empty sprite, so skip them
+    return win.blits([target.sprite() for target in targets if target.size >= 1])
+
+# Function to advance every target by one frame
+def update_targets(targets, grid):
+    """
+    Updates all targets in place, dropping the ones that shrank away.
+
+    Parameters:
+    - targets (list): A list of Target objects, compacted in place.
+    - grid (TargetGrid): The grid holding the same targets.
+
+    Returns:
+    int: The number of expired targets.
+    """
+    kept = 0
     for target in targets:
-        target.draw(win)
+        target.update()
+
+        if target.size <= 0:
+            grid.remove(target)
+            continue
+
+        targets[kept] = target
+        kept += 1
+    expired = len(targets) - kept
+    del targets[kept:]
+    return expired
+
+# Function to generate target spawn positions
+def spawn_positions(batch=SPAWN_BATCH):
+    """
+    Yields random target spawn positions, generating them in batches.
+
+    Parameters:
+    - batch (int): The number of positions generated per batch.
+
+    Yields:
+    tuple: An (x, y) position inside the padded play area.
+    """
+    xs = range(TARGET_PADDING, WIDTH - TARGET_PADDING + 1)
+    ys = range(TARGET_PADDING + TOP_BAR_HEIGHT, HEIGHT - TARGET_PADDING + 1)
+    while True:
+        yield from zip(random.choices(xs, k=batch), random.choices(ys, k=batch))
 
 # Function to format time as a string
-def format_time(secs):
+@lru_cache(maxsize=4096)
+def format_time(tenths):
     """
-    Formats time in seconds as a string in the format "MM:SS:mm".
+    Formats time in tenths of a second as a string in the format "MM:SS:t".
 
     Parameters:
-    - secs (float): Time in seconds.
+    - tenths (int): Time in tenths of a second.
 
     Returns:
     str: The formatted time string.
     """
-    milli = math.floor(int(secs * 1000 % 1000) / 100)
-    seconds = int(round(secs % 60, 1))
-    minutes = int(secs // 60)
-    return f"{minutes:02d}:{seconds:02d}:{milli}"
+    seconds, tenths = divmod(tenths, 10)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes:02d}:{seconds:02d}:{tenths}"
+
+# Function to render a label, reusing surfaces for text that hasn't changed
+@lru_cache(maxsize=64)
+def render_label(text, color="black"):
+    """
+    Renders a label with the label font, caching the most recently used surfaces.
+
+    Parameters:
+    - text (str): The text of the label.
+    - color (str): The color of the text.
+
+    Returns:
+    pygame.Surface: The rendered label.
+    """
+    return LABEL_FONT.render(text, color)[0]
 
 # Function to draw the top bar with game information
-def draw_top_bar(win, elapsed_time, targets_pressed, misses):
+def draw_top_bar(win, time_text, speed, targets_pressed, misses):
     """
     Draws the top bar with game information on the window.
 
     Parameters:
     - win (pygame.Surface): The Pygame window surface.
-    - elapsed_time (float): Elapsed time in seconds.
+    - time_text (str): Elapsed time, formatted by `format_time`.
+    - speed (float): Targets pressed per second.
     - targets_pressed (int): Number of targets pressed.
     - misses (int): Number of misses.
     """
-    pygame.draw.rect(win, "grey", (0, 0, WIDTH, TOP_BAR_HEIGHT))
-    time_label = LABEL_FONT.render(f"Time: {format_time(elapsed_time)}", 1, "black")
-    speed = round(targets_pressed / elapsed_time, 1)
-    speed_label = LABEL_FONT.render(f"Speed: {speed} t/s", 1, "black")
-    hits_label = LABEL_FONT.render(f"Hits: {targets_pressed}", 1, "black")
-    lives_label = LABEL_FONT.render(f"Lives: {LIVES - misses}", 1, "black")
+    win.blit(BG_SURF, TOP_BAR_RECT, TOP_BAR_RECT)
+    time_label = render_label(f"Time: {time_text}")
+    speed_label = render_label(f"Speed: {speed} t/s")
+    hits_label = render_label(f"Hits: {targets_pressed}")
+    lives_label = render_label(f"Lives: {LIVES - misses}")
     win.blit(time_label, (5, 5))
     win.blit(speed_label, (200, 5))
     win.blit(hits_label, (450, 5))
     win.blit(lives_label, (650, 5))
 
 # Function to display the end screen
-def end_screen(win, elapsed_time, targets_pressed, clicks):
+def end_screen(win, elapsed_ms, targets_pressed, clicks):
     """
     Displays the end screen with game statistics.
 
     Parameters:
     - win (pygame.Surface): The Pygame window surface.
-    - elapsed_time (float): Elapsed time in seconds.
+    - elapsed_ms (int): Elapsed time in milliseconds.
     - targets_pressed (int): Number of targets pressed.
     - clicks (int): Number of clicks.
     """
     win.fill(BG_COLOR)
-    time_label = LABEL_FONT.render(f"Time: {format_time(elapsed_time)}", 1, "white")
-    speed = round(targets_pressed / elapsed_time, 1)
-    speed_label = LABEL_FONT.render(f"Speed: {speed} t/s", 1, "white")
-    hits_label = LABEL_FONT.render(f"Hits: {targets_pressed}", 1, "white")
+    time_label = LABEL_FONT.render(f"Time: {format_time(elapsed_ms // 100)}", "white")[0]
+    speed = round(targets_pressed * 1000 / elapsed_ms, 1)
+    speed_label = LABEL_FONT.render(f"Speed: {speed} t/s", "white")[0]
+    hits_label = LABEL_FONT.render(f"Hits: {targets_pressed}", "white")[0]
     accuracy = round(targets_pressed / clicks * 100, 1)
-    accuracy_label = LABEL_FONT.render(f"Accuracy: {accuracy}%", 1, "white")
+    accuracy_label = LABEL_FONT.render(f"Accuracy: {accuracy}%", "white")[0]
     win.blit(time_label, (get_middle(time_label), 100))
     win.blit(speed_label, (get_middle(speed_label), 200))
     win.blit(hits_label, (get_middle(hits_label), 300))
@@ -198,52 +379,95 @@ def main():
     """
     run = True
     targets = []
+    grid = TargetGrid()
+    positions = spawn_positions()
     clock = pygame.time.Clock()
     targets_pressed = 0
     clicks = 0
     misses = 0
-    start_time = time.time()
-
-    pygame.time.set_timer(TARGET_EVENT, TARGET_INCREMENT)
+    start_ticks = pygame.time.get_ticks()
+    next_spawn = start_ticks + TARGET_INCREMENT
+    tenths = -1
+    target_rects = []
+    top_bar = None
+    repaint = True
+    QUIT, MOUSEBUTTONDOWN = pygame.QUIT, pygame.MOUSEBUTTONDOWN
+    EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+    # Only queue the events we handle (KEYDOWN closes the end screen)
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([QUIT, MOUSEBUTTONDOWN, pygame.KEYDOWN, *EXPOSE_EVENTS])
 
     while run:
         clock.tick(60)
         click = False
         mouse_pos = pygame.mouse.get_pos()
-        elapsed_time = time.time() - start_time
+        now = pygame.time.get_ticks()
+        elapsed_ms = now - start_ticks
 
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            if event.type == QUIT:
                 run = False
                 break
 
-            if event.type == TARGET_EVENT:
-                x = random.randint(TARGET_PADDING, WIDTH - TARGET_PADDING)
-                y = random.randint(TARGET_PADDING + TOP_BAR_HEIGHT, HEIGHT - TARGET_PADDING)
-                target = Target(x, y)
-                targets.append(target)
-
-            if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.type == MOUSEBUTTONDOWN:
                 click = True
                 clicks += 1
 
-        for target in targets:
-            target.update()
+            if event.type in EXPOSE_EVENTS:
+                repaint = True
 
-            if target.size <= 0:
-                targets.remove(target)
-                misses += 1
+        # Spawn on a fixed schedule by comparing ticks instead of a timer event
+        if now >= next_spawn:
+            target = Target(*next(positions))
+            targets.append(target)
+            grid.add(target)
+            next_spawn += TARGET_INCREMENT
 
-            if click and target.collide(*mouse_pos):
+        misses += update_targets(targets, grid)
+
+        # Most frames have no click; a click only ever hits the frontmost target
+        hit = False
+        if click:
+            target = grid.hit(*mouse_pos)
+            if target is not None:
+                grid.remove(target)
                 targets.remove(target)
                 targets_pressed += 1
+                hit = True
 
-        if misses >= LIVES:
-            end_screen(WIN, elapsed_time, targets_pressed, clicks)
+        # The displayed time only has tenth-of-a-second resolution
+        if elapsed_ms // 100 != tenths or hit:
+            tenths = elapsed_ms // 100
+            time_text = format_time(tenths)
+            speed = round(targets_pressed * 1000 / elapsed_ms, 1) if elapsed_ms else 0.0
 
-        draw(WIN, targets)
-        draw_top_bar(WIN, elapsed_time, targets_pressed, misses)
-        pygame.display.update()
+        if misses >= LIVES:
+            end_screen(WIN, elapsed_ms, targets_pressed, clicks)
+
+        # Paint the whole window on start-up and whenever the window system
+        # asks for it; otherwise only changed areas are pushed
+        if repaint:
+            WIN.blit(BG_SURF, (0, 0))
+            target_rects = []
+            top_bar = None
+
+        drawn_rects = draw(WIN, targets, target_rects)
+        dirty_rects = target_rects + drawn_rects
+        target_rects = drawn_rects
+
+        # The top bar is only redrawn and pushed when what it shows changed
+        shown = (time_text, speed, targets_pressed, misses)
+        if shown != top_bar:
+            top_bar = shown
+            draw_top_bar(WIN, *shown)
+            dirty_rects.append(TOP_BAR_RECT)
+
+        if repaint:
+            pygame.display.update()
+            repaint = False
+        else:
+            pygame.display.update(dirty_rects)
 
     pygame.quit()
 